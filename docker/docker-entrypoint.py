@@ -86,6 +86,9 @@ MONGODB_PASSWORD_ENV_VARS = (
 # Environment variables used for init db
 MONGODB_INITDB_ENV_VARS = ("MONGODB_INITDB_DATABASE", "MONGO_INITDB_DATABASE")
 
+# Environment variable used to set a minimum oplog retention period
+MONGODB_OPLOG_MIN_RETENTION_HOURS_ENV_VAR = "MONGODB_OPLOG_MIN_RETENTION_HOURS"
+
 
 def auth_enabled() -> bool:
     """Check environment variables to see if this container uses auth."""
@@ -158,6 +161,31 @@ def has_bind_ip() -> bool:
     )
 
 
+def has_oplog_min_retention_hours() -> bool:
+    """Check whether --oplogMinRetentionHours has been set."""
+    # 0 is a valid setting (no minimum), so compare against None rather than checking truthiness
+    args = get_entrypoint_args()
+    config_dict = get_config_as_dict()
+    return any(
+        [
+            args.oplogMinRetentionHours is not None,
+            config_dict.get("storage", {}).get("oplogMinRetentionHours", None) is not None,
+        ]
+    )
+
+
+def get_oplog_min_retention_hours() -> str:
+    """Get the minimum oplog retention period from the environment, if set."""
+    oplog_min_retention_hours = os.environ.get(MONGODB_OPLOG_MIN_RETENTION_HOURS_ENV_VAR, "")
+    if oplog_min_retention_hours and not re.fullmatch(r"\d+(\.\d+)?", oplog_min_retention_hours):
+        print(
+            f"error: {MONGODB_OPLOG_MIN_RETENTION_HOURS_ENV_VAR} must be a non-negative number of hours, got '{oplog_min_retention_hours}'.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    return oplog_min_retention_hours
+
+
 ################################# FUNCTIONS FOR INITIALIZE DB #####################################
 
 INITDB_SCRIPTS_FILEPATH = "/docker-entrypoint-initdb.d"
@@ -483,6 +511,9 @@ def get_final_command_line_args() -> List[str]:
         args.append("--auth")
     if not has_bind_ip():
         args.append("--bind_ip_all")
+    oplog_min_retention_hours = get_oplog_min_retention_hours()
+    if oplog_min_retention_hours and not has_oplog_min_retention_hours():
+        args += ["--oplogMinRetentionHours", oplog_min_retention_hours]
     return args
 
 
@@ -571,6 +602,10 @@ def get_entrypoint_parser() -> argparse.ArgumentParser:
         "--bind_ip_all",
         action="store_true",
     )
+    parser.add_argument(
+        "--oplogMinRetentionHours",
+        default=None,
+    )
     return parser
 
 
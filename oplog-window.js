@@ -0,0 +1,232 @@
+const { MongoClient } = require("mongodb");
+const { parseArgs } = require("node:util");
+
+// Samples the oplog on the primary and projects how many hours of writes it
+// can hold at the current rate. A member that is down for longer than this
+// window falls off the oplog and needs a full resync when it comes back.
+//
+//   npm run oplog-window -- --targetHours 24 [--apply]
+//
+// With --apply, replSetResizeOplog is run on every member whenever the
+// projected window drops below the target.
+
+const USAGE =
+  "Usage: npm run oplog-window -- [--uri <uri>] [--targetHours <hours>] " +
+  "[--intervalSeconds <seconds>] [--samples <count>] [--apply]";
+
+function usageError(message) {
+  console.error(message);
+  console.error(USAGE);
+  process.exit(1);
+}
+
+let options;
+try {
+  ({ values: options } = parseArgs({
+    options: {
+      uri: {
+        type: "string",
+        default: "mongodb://mongo0:27017,mongo1:27017,mongo2:27017/?authSource=admin&replicaSet=mongodb-repl-set"
+      },
+      targetHours: { type: "string", default: "24" },
+      intervalSeconds: { type: "string", default: "60" },
+      // Number of samples the insert rate is averaged over
+      samples: { type: "string", default: "10" },
+      apply: { type: "boolean", default: false }
+    }
+  }));
+} catch (err) {
+  usageError(err.message);
+}
+
+function parsePositive(name, { integer = false } = {}) {
+  const value = Number(options[name]);
+  if (!Number.isFinite(value) || value <= 0 || (integer && !Number.isInteger(value))) {
+    usageError(`--${name} must be a positive ${integer ? "integer" : "number"}, got "${options[name]}"`);
+  }
+  return value;
+}
+
+const targetHours = parsePositive("targetHours");
+const intervalMs = parsePositive("intervalSeconds") * 1000;
+const maxSamples = parsePositive("samples", { integer: true });
+
+// replSetResizeOplog refuses anything smaller than 990 MB
+const MIN_OPLOG_SIZE_MB = 990;
+// Size the oplog a little above the target so that a burst of writes doesn't
+// immediately put us back under it
+const RESIZE_HEADROOM = 1.2;
+
+const client = new MongoClient(options.uri);
+
+function log(message) {
+  console.log(`[${new Date().toISOString()}] ${message}`);
+}
+
+function formatHours(hours) {
+  return Number.isFinite(hours) ? `${hours.toFixed(1)}h` : "unbounded";
+}
+
+// Point --uri at a single member, keeping its credentials and options. URL
+// can't parse a comma-separated host list, so swap that out first.
+function memberUri(host) {
+  const [, scheme, userinfo = ""] = options.uri.match(/^(mongodb(?:\+srv)?):\/\/([^@/]*@)?[^/?]*/);
+  const url = new URL(options.uri.replace(/^mongodb(?:\+srv)?:\/\/(?:[^@/]*@)?[^/?]*/, `mongodb://${userinfo}${host}`));
+  // mongodb+srv turns TLS on and takes authSource from the SRV record's TXT
+  // entry; plain mongodb:// does neither, so set them explicitly
+  if (scheme === "mongodb+srv") {
+    if (!url.searchParams.has("tls") && !url.searchParams.has("ssl")) {
+      url.searchParams.set("tls", "true");
+    }
+    if (!url.searchParams.has("authSource")) {
+      url.searchParams.set("authSource", "admin");
+    }
+  }
+  url.searchParams.delete("replicaSet");
+  url.searchParams.set("directConnection", "true");
+  url.pathname = url.pathname || "/";
+  return url.toString();
+}
+
+async function getStorageStats(oplog) {
+  const [stats] = await oplog.aggregate([{ $collStats: { storageStats: {} } }]).toArray();
+  return stats.storageStats;
+}
+
+async function getOplogStats(oplog) {
+  const { maxSize, size } = await getStorageStats(oplog);
+  const first = await oplog.find({}, { projection: { ts: 1 } }).sort({ $natural: 1 }).limit(1).next();
+  const last = await oplog.find({}, { projection: { ts: 1 } }).sort({ $natural: -1 }).limit(1).next();
+  return {
+    maxSize,
+    size,
+    firstTs: first.ts,
+    lastTs: last.ts
+  };
+}
+
+// Count and measure the entries written since the previous sample
+async function getEntriesSince(oplog, sinceTs) {
+  const [result] = await oplog.aggregate([
+    { $match: { ts: { $gt: sinceTs } } },
+    {
+      $group: {
+        _id: null,
+        count: { $sum: 1 },
+        bytes: { $sum: { $bsonSize: "$$ROOT" } },
+        lastTs: { $max: "$ts" }
+      }
+    }
+  ]).toArray();
+  return result ?? { count: 0, bytes: 0, lastTs: sinceTs };
+}
+
+// oplogMinRetentionHours the member was started with, from the command line
+// or the config file
+async function getMinRetentionHours(memberClient) {
+  const { parsed } = await memberClient.db("admin").command({ getCmdLineOpts: 1 });
+  return Number(parsed.storage?.oplogMinRetentionHours ?? 0);
+}
+
+// replSetResizeOplog only changes the member it is run on, so connect to each
+// data-bearing member directly. Only settings below what's needed are sent,
+// so neither a member's oplog size nor its minimum retention is ever lowered.
+async function resizeOplogs(sizeMB) {
+  const { config } = await client.db("admin").command({ replSetGetConfig: 1 });
+  for (const member of config.members.filter((m) => !m.arbiterOnly)) {
+    const memberClient = new MongoClient(memberUri(member.host));
+    try {
+      await memberClient.connect();
+      const { maxSize } = await getStorageStats(memberClient.db("local").collection("oplog.rs"));
+      const resize = { replSetResizeOplog: 1 };
+      if (sizeMB * 1024 * 1024 > maxSize) {
+        resize.size = sizeMB;
+      }
+      if ((await getMinRetentionHours(memberClient)) < targetHours) {
+        resize.minRetentionHours = targetHours;
+      }
+      if (resize.size === undefined && resize.minRetentionHours === undefined) {
+        log(`Oplog on ${member.host} already meets the target`);
+        continue;
+      }
+      await memberClient.db("admin").command(resize);
+      log(
+        `Updated oplog on ${member.host}: ` +
+        `size ${resize.size ?? (maxSize / 1024 / 1024).toFixed(0)} MB` +
+        (resize.minRetentionHours ? `, minRetentionHours ${resize.minRetentionHours}` : "")
+      );
+    } catch (err) {
+      console.error(`Resize error on ${member.host}:`, err.message);
+    } finally {
+      await memberClient.close();
+    }
+  }
+}
+
+async function main() {
+  await client.connect();
+
+  const oplog = client.db("local").collection("oplog.rs");
+  const samples = [];
+  let lastTs = (await getOplogStats(oplog)).lastTs;
+  let lastSampleTime = Date.now();
+
+  log(`Sampling oplog every ${intervalMs / 1000}s, target window ${formatHours(targetHours)}`);
+
+  async function sample() {
+    const now = Date.now();
+    const entries = await getEntriesSince(oplog, lastTs);
+    samples.push({ seconds: (now - lastSampleTime) / 1000, count: entries.count, bytes: entries.bytes });
+    if (samples.length > maxSamples) {
+      samples.shift();
+    }
+    lastTs = entries.lastTs;
+    lastSampleTime = now;
+
+    const seconds = samples.reduce((total, s) => total + s.seconds, 0);
+    const count = samples.reduce((total, s) => total + s.count, 0);
+    const bytes = samples.reduce((total, s) => total + s.bytes, 0);
+    const bytesPerSecond = bytes / seconds;
+    const averageEntrySize = count ? bytes / count : 0;
+
+    const stats = await getOplogStats(oplog);
+    const spanHours = (stats.lastTs.getHighBits() - stats.firstTs.getHighBits()) / 3600;
+    // Based on maxSize alone: a minimum retention can keep more than this,
+    // but one set with replSetResizeOplog is lost when mongod restarts
+    const windowHours = stats.maxSize / bytesPerSecond / 3600;
+
+    log(
+      `${(count / seconds).toFixed(2)} entries/s, ${averageEntrySize.toFixed(0)} bytes/entry, ` +
+      `oplog ${(stats.size / 1024 / 1024).toFixed(1)}/${(stats.maxSize / 1024 / 1024).toFixed(0)} MB ` +
+      `spanning ${formatHours(spanHours)}, projected window ${formatHours(windowHours)}`
+    );
+
+    if (windowHours >= targetHours) {
+      return;
+    }
+    log(`WARNING: projected oplog window ${formatHours(windowHours)} is below the target of ${formatHours(targetHours)}`);
+
+    if (options.apply) {
+      const sizeMB = Math.max(
+        MIN_OPLOG_SIZE_MB,
+        Math.ceil((bytesPerSecond * targetHours * 3600 * RESIZE_HEADROOM) / 1024 / 1024)
+      );
+      await resizeOplogs(sizeMB);
+    }
+  }
+
+  // Only schedule the next sample once this one is done, so a slow round of
+  // resizes can't overlap with the next one
+  async function tick() {
+    try {
+      await sample();
+    } catch (err) {
+      console.error("Sample error:", err.message);
+    }
+    setTimeout(tick, intervalMs);
+  }
+
+  setTimeout(tick, intervalMs);
+}
+
+main().catch(console.error);